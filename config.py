@@ -39,6 +39,9 @@ class Config:
     DEBUG = os.getenv("DEBUG", "True").lower() == "true"
     RELOAD = os.getenv("RELOAD", "True").lower() == "true"
     
+    # Persist parsed iXBRL filings as pickle sidecars next to the HTML
+    PARSE_CACHE = os.getenv("HELIX_PARSE_CACHE", "False").lower() == "true"
+    
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "info")
     
@@ -0,0 +1,28 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Retry refused connections and gateway errors; read timeouts are not retried,
+# so a stalled call is bounded by its timeout instead of repeating it
+_http_retry = Retry(
+    total=2, connect=2, read=0, status=2, backoff_factor=0.2,
+    status_forcelist=(502, 503, 504), allowed_methods=frozenset(["GET", "POST"]),
+    raise_on_status=False,
+)
+
+# (connect, read) timeout for Ollama generate calls
+LLM_TIMEOUT_S = (3.05, 300)
+# (connect, read) timeout for the single synthesis generate call
+SYNTHESIS_TIMEOUT_S = (3.05, 120)
+
+
+def make_http_session(pool_connections: int, pool_maxsize: int) -> requests.Session:
+    """Create a keep-alive JSON session with pooled connections and the shared retry policy"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=_http_retry
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Content-Type"] = "application/json"
+    return session
@@ -1,16 +1,17 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 import time
+import asyncio
 import uuid
 from typing import Dict, Any, List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 import threading
 from celery.result import AsyncResult
 
-from models import get_db, create_tables, Job, EvidenceDossier, ResearchPlan, ResearchPlanStep, EvidenceItem, SessionLocal, LLMRequest, LLMRequestStatus, LLMRequestType, ToolRequest, ToolRequestStatus, ToolRequestType, DossierStatus, JobStatus, RevisionFeedback, SynthesisReport
+from models import get_db, create_tables, Job, EvidenceDossier, ResearchPlan, ResearchPlanStep, EvidenceItem, SessionLocal, LLMRequest, LLMRequestStatus, LLMRequestType, ToolRequest, ToolRequestStatus, ToolRequestType, DossierStatus, DossierType, JobStatus, RevisionFeedback, SynthesisReport, both_dossiers_approved
 from services import CannedResearchService
 from orchestrator_agent import orchestrator_task
 from synthesis_agent import synthesis_agent_task
@@ -89,6 +90,23 @@ class DossierReviewResponse(BaseModel):
     message: str
     job_status: str | None = None
 
+class DossierReviewBatchItem(DossierReviewRequest):
+    dossier_id: str
+
+class DossierReviewBatchRequest(BaseModel):
+    reviews: List[DossierReviewBatchItem]
+
+class DossierReviewResult(BaseModel):
+    dossier_id: str
+    status_code: int
+    detail: str | None = None  # Error message when the review was rejected
+    result: DossierReviewResponse | None = None
+
+class DossierReviewBatchResponse(BaseModel):
+    job_id: str
+    job_status: str
+    results: List[DossierReviewResult]
+
 class VerificationChecklist(BaseModel):
     review_summary: bool = False
     validate_proxy_logic: bool = False
@@ -160,14 +178,49 @@ async def read_report_viewer():
     """Serve the synthesis report viewer page"""
     return FileResponse("static/report.html")
 
+# Long-poll limits for the job status and report endpoints; the re-check
+# interval starts short and backs off so a long hold costs a handful of
+# refreshes, not hundreds
+STATUS_LONG_POLL_MAX_S = 30
+STATUS_LONG_POLL_INTERVAL_S = 0.1
+STATUS_LONG_POLL_INTERVAL_MAX_S = 2.0
+STATUS_LONG_POLL_BACKOFF = 1.7
+
+async def _long_poll(check, wait: float):
+    """Re-run `check` with backed-off sleeps until it returns True or `wait` seconds pass"""
+    deadline = time.monotonic() + min(wait, STATUS_LONG_POLL_MAX_S)
+    interval = STATUS_LONG_POLL_INTERVAL_S
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(interval, remaining))
+        if check():
+            return
+        interval = min(interval * STATUS_LONG_POLL_BACKOFF, STATUS_LONG_POLL_INTERVAL_MAX_S)
+
 @app.get("/v2/research/{job_id}/status", response_model=JobStatusResponse)
-async def get_job_status(job_id: str, db: Session = Depends(get_db)):
-    """Get the status of a research job from database and Celery task"""
+async def get_job_status(job_id: str, response: Response, since: Optional[str] = None, wait: float = 0,
+                         if_none_match: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """
+    Get the status of a research job from database and Celery task.
+    If `since` (the last status the client saw) and `wait` (seconds) are given,
+    the response is held until the status changes or the wait runs out, so
+    clients learn about transitions immediately instead of on their next poll.
+    Responses carry an ETag; a poll whose If-None-Match still matches gets an
+    empty 304 instead of the full body.
+    """
     
     job = db.query(Job).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
+    if since is not None and wait > 0 and job.status.value == since:
+        def status_changed():
+            db.refresh(job)
+            return job.status.value != since
+        await _long_poll(status_changed, wait)
+    
     # Get dossier IDs
     dossiers = db.query(EvidenceDossier).filter(EvidenceDossier.job_id == job_id).all()
     thesis_dossier_id = None
@@ -179,6 +232,13 @@ async def get_job_status(job_id: str, db: Session = Depends(get_db)):
         else:
             antithesis_dossier_id = dossier.id
     
+    # Everything else in the body is derived from the job status
+    etag = f'"{job.status.value}:{thesis_dossier_id}:{antithesis_dossier_id}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    
     # Check Celery task status (for jobs that are still processing)
     task_status = None
     task_progress = None
@@ -258,9 +318,8 @@ async def get_dossier(dossier_id: str, db: Session = Depends(get_db)):
 async def get_llm_requests(job_id: str, db: Session = Depends(get_db)):
     """Get all LLM requests for a specific job"""
     
-    # Verify job exists
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
+    # Verify job exists; select only the key so no Job object is built
+    if not db.query(Job.id).filter(Job.id == job_id).first():
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Get all LLM requests for this job
@@ -306,9 +365,8 @@ async def get_llm_requests(job_id: str, db: Session = Depends(get_db)):
 async def get_tool_requests(job_id: str, db: Session = Depends(get_db)):
     """Get all tool requests for a job, grouped by status"""
     
-    # Verify job exists
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
+    # Verify job exists; select only the key so no Job object is built
+    if not db.query(Job.id).filter(Job.id == job_id).first():
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Get all tool requests for the job
@@ -371,14 +429,12 @@ async def get_recent_jobs(db: Session = Depends(get_db)):
 
 # Checkpoint 6 - Human Adjudicator API Endpoints
 
-@app.post("/v3/dossiers/{dossier_id}/review", response_model=DossierReviewResponse)
-async def review_dossier(dossier_id: str, review_request: DossierReviewRequest, db: Session = Depends(get_db)):
-    """Review and approve or request revision for a dossier"""
-    
-    # Verify dossier exists
-    dossier = db.query(EvidenceDossier).filter(EvidenceDossier.id == dossier_id).first()
-    if not dossier:
-        raise HTTPException(status_code=404, detail="Dossier not found")
+def _apply_review(db: Session, dossier: EvidenceDossier, review_request: DossierReviewRequest):
+    """
+    Validate and apply one review to a dossier without committing.
+    Returns the response and a callable that enqueues the follow-up Celery task;
+    the caller runs it only after the review has been committed.
+    """
     
     # Verify dossier is in correct status
     if dossier.status != DossierStatus.AWAITING_VERIFICATION:
@@ -387,38 +443,27 @@ async def review_dossier(dossier_id: str, review_request: DossierReviewRequest,
     if review_request.action == "APPROVE":
         # Approve the dossier
         dossier.status = DossierStatus.APPROVED
-        db.commit()
+        db.flush()
         
         # Check if both dossiers are now approved
         job = dossier.job
-        thesis_dossier = db.query(EvidenceDossier).filter(
-            EvidenceDossier.job_id == job.id,
-            EvidenceDossier.dossier_type == "THESIS"
-        ).first()
-        antithesis_dossier = db.query(EvidenceDossier).filter(
-            EvidenceDossier.job_id == job.id,
-            EvidenceDossier.dossier_type == "ANTITHESIS"
-        ).first()
-        
-        if thesis_dossier.status == DossierStatus.APPROVED and antithesis_dossier.status == DossierStatus.APPROVED:
+        if both_dossiers_approved(db, job.id):
             # Both dossiers approved - trigger synthesis
             job.status = JobStatus.COMPLETE
-            db.commit()
-            
-            # Trigger synthesis agent task
-            synthesis_agent_task.delay(job.id)
+            db.flush()
             
+            job_id = job.id
             return DossierReviewResponse(
                 success=True,
                 message="Dossier approved. Both dossiers approved - synthesis will begin.",
                 job_status="COMPLETE"
-            )
+            ), lambda: synthesis_agent_task.delay(job_id)
         else:
             return DossierReviewResponse(
                 success=True,
                 message="Dossier approved. Awaiting approval of other dossier.",
                 job_status="AWAITING_VERIFICATION"
-            )
+            ), None
     
     elif review_request.action == "REVISE":
         if not review_request.feedback:
@@ -427,46 +472,91 @@ async def review_dossier(dossier_id: str, review_request: DossierReviewRequest,
         # Store revision feedback
         revision_feedback = RevisionFeedback(
             id=f"rev-{uuid.uuid4().hex[:8]}",
-            dossier_id=dossier_id,
+            dossier_id=dossier.id,
             feedback=review_request.feedback
         )
         db.add(revision_feedback)
         
         # Request revision
         dossier.status = DossierStatus.REVISION_REQUESTED
-        db.commit()
+        db.flush()
         
         # Re-enqueue research agent task
         from research_agent import research_agent_task
-        research_agent_task.delay(dossier_id)
-        
+        dossier_id = dossier.id
         return DossierReviewResponse(
             success=True,
             message="Revision requested. Research agent will be re-enqueued with feedback.",
             job_status="REVISING"
-        )
+        ), lambda: research_agent_task.delay(dossier_id)
     
     else:
         raise HTTPException(status_code=400, detail="Invalid action. Must be 'APPROVE' or 'REVISE'")
 
+@app.post("/v3/dossiers/{dossier_id}/review", response_model=DossierReviewResponse)
+async def review_dossier(dossier_id: str, review_request: DossierReviewRequest, db: Session = Depends(get_db)):
+    """Review and approve or request revision for a dossier"""
+    
+    # Verify dossier exists
+    dossier = db.query(EvidenceDossier).filter(EvidenceDossier.id == dossier_id).first()
+    if not dossier:
+        raise HTTPException(status_code=404, detail="Dossier not found")
+    
+    response, enqueue = _apply_review(db, dossier, review_request)
+    db.commit()
+    if enqueue:
+        enqueue()
+    return response
+
+@app.post("/v3/jobs/{job_id}/review/batch", response_model=DossierReviewBatchResponse)
+async def review_dossiers_batch(job_id: str, batch_request: DossierReviewBatchRequest, db: Session = Depends(get_db)):
+    """
+    Apply several dossier reviews for a job in one request and one transaction.
+    Each review gets its own result; a rejected review does not stop the rest.
+    """
+    
+    # Load the job together with its dossiers in a single query
+    job = db.query(Job).options(joinedload(Job.dossiers)).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    dossiers = {dossier.id: dossier for dossier in job.dossiers}
+    
+    results = []
+    follow_ups = []
+    for review in batch_request.reviews:
+        dossier = dossiers.get(review.dossier_id)
+        if not dossier:
+            results.append(DossierReviewResult(dossier_id=review.dossier_id, status_code=404, detail="Dossier not found"))
+            continue
+        try:
+            response, enqueue = _apply_review(db, dossier, review)
+        except HTTPException as e:
+            results.append(DossierReviewResult(dossier_id=review.dossier_id, status_code=e.status_code, detail=e.detail))
+            continue
+        results.append(DossierReviewResult(dossier_id=review.dossier_id, status_code=200, result=response))
+        if enqueue:
+            follow_ups.append(enqueue)
+    
+    db.commit()
+    for enqueue in follow_ups:
+        enqueue()
+    
+    return DossierReviewBatchResponse(job_id=job_id, job_status=job.status.value, results=results)
+
 @app.get("/v3/jobs/{job_id}/verification-status")
 async def get_verification_status(job_id: str, db: Session = Depends(get_db)):
     """Get the verification status for both dossiers in a job"""
     
-    # Verify job exists
-    job = db.query(Job).filter(Job.id == job_id).first()
+    # Load the job together with its dossiers in a single query
+    job = db.query(Job).options(joinedload(Job.dossiers)).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Get both dossiers
-    thesis_dossier = db.query(EvidenceDossier).filter(
-        EvidenceDossier.job_id == job_id,
-        EvidenceDossier.dossier_type == "THESIS"
-    ).first()
-    antithesis_dossier = db.query(EvidenceDossier).filter(
-        EvidenceDossier.job_id == job_id,
-        EvidenceDossier.dossier_type == "ANTITHESIS"
-    ).first()
+    dossiers_by_type = {}
+    for dossier in job.dossiers:
+        dossiers_by_type.setdefault(dossier.dossier_type, dossier)
+    thesis_dossier = dossiers_by_type.get(DossierType.THESIS)
+    antithesis_dossier = dossiers_by_type.get(DossierType.ANTITHESIS)
     
     if not thesis_dossier or not antithesis_dossier:
         raise HTTPException(status_code=404, detail="Dossiers not found")
@@ -477,31 +567,50 @@ async def get_verification_status(job_id: str, db: Session = Depends(get_db)):
         "thesis_dossier": {
             "id": thesis_dossier.id,
             "status": thesis_dossier.status.value,
-            "mission": thesis_dossier.mission
+            "mission": thesis_dossier.mission,
+            "updated_at": thesis_dossier.updated_at.isoformat() if thesis_dossier.updated_at else None
         },
         "antithesis_dossier": {
             "id": antithesis_dossier.id,
             "status": antithesis_dossier.status.value,
-            "mission": antithesis_dossier.mission
+            "mission": antithesis_dossier.mission,
+            "updated_at": antithesis_dossier.updated_at.isoformat() if antithesis_dossier.updated_at else None
         }
     }
 
 @app.get("/v3/jobs/{job_id}/report")
-async def get_final_report(job_id: str, db: Session = Depends(get_db)):
-    """Get the final synthesis report for a completed job"""
+async def get_final_report(job_id: str, response: Response, wait: float = 0, db: Session = Depends(get_db)):
+    """
+    Get the final synthesis report for a completed job.
+    The job is marked COMPLETE when both dossiers are approved, before the
+    synthesis task has written the report; if `wait` (seconds) is given, the
+    response is held until the report appears or the wait runs out. A complete
+    job whose report is not written yet answers 202 with status "pending".
+    """
     
     # Verify job exists and is complete
     job = db.query(Job).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
+    def report_written():
+        return db.query(SynthesisReport.id).filter(SynthesisReport.job_id == job_id).first() is not None
+    
+    if wait > 0 and job.status == JobStatus.COMPLETE and not report_written():
+        await _long_poll(report_written, wait)
+    
     if job.status != JobStatus.COMPLETE:
         raise HTTPException(status_code=400, detail="Job is not complete. Synthesis report not available yet.")
     
     # Get the synthesis report
     synthesis_report = db.query(SynthesisReport).filter(SynthesisReport.job_id == job_id).first()
     if not synthesis_report:
-        raise HTTPException(status_code=404, detail="Synthesis report not found")
+        response.status_code = 202
+        return {
+            "job_id": job_id,
+            "status": "pending",
+            "detail": "Synthesis report not written yet"
+        }
     
     return {
         "job_id": job_id,
@@ -39,6 +39,8 @@ create_tables()
 @app.get("/manifest")
 async def get_manifest():
     """Return the MCP server manifest with available tools"""
+    # The research agent picks tools from this list, so only tools it can
+    # dispatch are advertised; the batch fact tool is /tools/execute-only
     return {
         "name": "AR v3.0 MCP Server",
         "version": "3.0.0",
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Text, ForeignKey, Enum, JSON
+from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Text, ForeignKey, Enum, JSON, Index, and_, exists
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
@@ -65,6 +65,10 @@ class Job(Base):
 
 class EvidenceDossier(Base):
     __tablename__ = "evidence_dossiers"
+    # Serves job_id lookups as well as the per-type approval check
+    __table_args__ = (
+        Index("ix_evidence_dossiers_job_type_status", "job_id", "dossier_type", "status"),
+    )
     
     id = Column(String, primary_key=True)
     job_id = Column(String, ForeignKey("jobs.id"), nullable=False)
@@ -84,7 +88,7 @@ class ResearchPlan(Base):
     __tablename__ = "research_plans"
     
     id = Column(String, primary_key=True)
-    dossier_id = Column(String, ForeignKey("evidence_dossiers.id"), nullable=False)
+    dossier_id = Column(String, ForeignKey("evidence_dossiers.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -96,7 +100,7 @@ class ResearchPlanStep(Base):
     __tablename__ = "research_plan_steps"
     
     id = Column(String, primary_key=True)
-    research_plan_id = Column(String, ForeignKey("research_plans.id"), nullable=False)
+    research_plan_id = Column(String, ForeignKey("research_plans.id"), nullable=False, index=True)
     step_number = Column(Integer, nullable=False)
     description = Column(Text, nullable=False)
     status = Column(Enum(StepStatus), default=StepStatus.PENDING)
@@ -117,7 +121,7 @@ class EvidenceItem(Base):
     __tablename__ = "evidence_items"
     
     id = Column(String, primary_key=True)
-    dossier_id = Column(String, ForeignKey("evidence_dossiers.id"), nullable=False)
+    dossier_id = Column(String, ForeignKey("evidence_dossiers.id"), nullable=False, index=True)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
     source = Column(String, nullable=False)
@@ -133,7 +137,7 @@ class LLMRequest(Base):
     __tablename__ = "llm_requests"
     
     id = Column(String, primary_key=True)
-    job_id = Column(String, ForeignKey("jobs.id"), nullable=False)
+    job_id = Column(String, ForeignKey("jobs.id"), nullable=False, index=True)
     dossier_id = Column(String, ForeignKey("evidence_dossiers.id"), nullable=True)  # Optional, for dossier-specific requests
     request_type = Column(Enum(LLMRequestType), nullable=False)
     status = Column(Enum(LLMRequestStatus), default=LLMRequestStatus.PENDING)
@@ -152,7 +156,7 @@ class ToolRequest(Base):
     __tablename__ = "tool_requests"
     
     id = Column(String, primary_key=True)
-    job_id = Column(String, ForeignKey("jobs.id"), nullable=False)
+    job_id = Column(String, ForeignKey("jobs.id"), nullable=False, index=True)
     dossier_id = Column(String, ForeignKey("evidence_dossiers.id"), nullable=True)  # Optional, for dossier-specific requests
     step_id = Column(String, ForeignKey("research_plan_steps.id"), nullable=True)  # Optional, for step-specific requests
     request_type = Column(Enum(ToolRequestType), nullable=False)
@@ -175,7 +179,7 @@ class RevisionFeedback(Base):
     __tablename__ = "revision_feedback"
     
     id = Column(String, primary_key=True)
-    dossier_id = Column(String, ForeignKey("evidence_dossiers.id"), nullable=False)
+    dossier_id = Column(String, ForeignKey("evidence_dossiers.id"), nullable=False, index=True)
     feedback = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     processed_at = Column(DateTime, nullable=True)
@@ -188,7 +192,7 @@ class SynthesisReport(Base):
     __tablename__ = "synthesis_reports"
     
     id = Column(String, primary_key=True)
-    job_id = Column(String, ForeignKey("jobs.id"), nullable=False)
+    job_id = Column(String, ForeignKey("jobs.id"), nullable=False, index=True)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -197,15 +201,39 @@ class SynthesisReport(Base):
 
 # Database setup
 DATABASE_URL = "sqlite:///./ar_system.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Long-polled status/report requests hold their session for up to 30s, so the
+# pool is sized for several open review pages on top of the regular endpoints
+DB_POOL_SIZE = 10
+DB_MAX_OVERFLOW = 20
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    # create_all only adds indexes along with new tables; backfill them on
+    # databases created before the foreign-key lookups were indexed
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close() 
+
+def both_dossiers_approved(db, job_id: str) -> bool:
+    """Whether the job's thesis and antithesis dossiers are both APPROVED, checked in one query"""
+    def approved(dossier_type):
+        return exists().where(
+            EvidenceDossier.job_id == job_id,
+            EvidenceDossier.dossier_type == dossier_type,
+            EvidenceDossier.status == DossierStatus.APPROVED,
+        )
+    return bool(db.query(and_(approved(DossierType.THESIS), approved(DossierType.ANTITHESIS))).scalar())
@@ -1,11 +1,11 @@
 import uuid
 from typing import Optional
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from models import (
     Job, EvidenceDossier, ResearchPlan, ResearchPlanStep, 
-    JobStatus, DossierStatus, DossierType, SessionLocal
+    JobStatus, DossierStatus, DossierType, SessionLocal, both_dossiers_approved
 )
 from pydantic_models import ResearchJob, EvidenceDossier as PydanticEvidenceDossier
 from celery_app import celery_app
@@ -105,19 +105,7 @@ def trigger_synthesis_if_ready(job_id: str, background_tasks=None):
             return False
             
         # Check if both dossiers are approved
-        thesis_dossier = db.query(EvidenceDossier).filter(
-            EvidenceDossier.job_id == job_id,
-            EvidenceDossier.dossier_type == DossierType.THESIS
-        ).first()
-        
-        antithesis_dossier = db.query(EvidenceDossier).filter(
-            EvidenceDossier.job_id == job_id,
-            EvidenceDossier.dossier_type == DossierType.ANTITHESIS
-        ).first()
-        
-        if (thesis_dossier and antithesis_dossier and 
-            thesis_dossier.status == DossierStatus.APPROVED and 
-            antithesis_dossier.status == DossierStatus.APPROVED):
+        if both_dossiers_approved(db, job_id):
             
             # Update job status
             job.status = JobStatus.COMPLETE
@@ -147,19 +135,16 @@ def get_job_status(job_id: str):
     """Get the current status of a research job"""
     db = SessionLocal()
     try:
-        job = db.query(Job).filter(Job.id == job_id).first()
+        # Load the job together with its dossiers in a single query
+        job = db.query(Job).options(joinedload(Job.dossiers)).filter(Job.id == job_id).first()
         if not job:
             return None
             
-        thesis_dossier = db.query(EvidenceDossier).filter(
-            EvidenceDossier.job_id == job_id,
-            EvidenceDossier.dossier_type == DossierType.THESIS
-        ).first()
-        
-        antithesis_dossier = db.query(EvidenceDossier).filter(
-            EvidenceDossier.job_id == job_id,
-            EvidenceDossier.dossier_type == DossierType.ANTITHESIS
-        ).first()
+        dossiers_by_type = {}
+        for dossier in job.dossiers:
+            dossiers_by_type.setdefault(dossier.dossier_type, dossier)
+        thesis_dossier = dossiers_by_type.get(DossierType.THESIS)
+        antithesis_dossier = dossiers_by_type.get(DossierType.ANTITHESIS)
         
         return {
             "job_id": job_id,
@@ -178,19 +163,13 @@ def get_dossiers(job_id: str):
     """Get both thesis and antithesis dossiers for a job"""
     db = SessionLocal()
     try:
-        thesis_dossier = db.query(EvidenceDossier).filter(
-            EvidenceDossier.job_id == job_id,
-            EvidenceDossier.dossier_type == DossierType.THESIS
-        ).first()
-        
-        antithesis_dossier = db.query(EvidenceDossier).filter(
-            EvidenceDossier.job_id == job_id,
-            EvidenceDossier.dossier_type == DossierType.ANTITHESIS
-        ).first()
+        dossiers_by_type = {}
+        for dossier in db.query(EvidenceDossier).filter(EvidenceDossier.job_id == job_id):
+            dossiers_by_type.setdefault(dossier.dossier_type, dossier)
         
         return {
-            "thesis_dossier": thesis_dossier,
-            "antithesis_dossier": antithesis_dossier
+            "thesis_dossier": dossiers_by_type.get(DossierType.THESIS),
+            "antithesis_dossier": dossiers_by_type.get(DossierType.ANTITHESIS)
         }
         
     finally:
@@ -1,7 +1,8 @@
 import uuid
 import json
-import requests
+import orjson
 from logging_config import get_file_logger
+from http_client import make_http_session, LLM_TIMEOUT_S
 from sqlalchemy.orm import Session
 from models import (
     Job, EvidenceDossier, ResearchPlan, ResearchPlanStep,
@@ -13,6 +14,10 @@ from research_agent import research_agent_task
 from datetime import datetime
 import time
 
+# Shared keep-alive session for Ollama calls so consecutive mission and plan
+# prompts reuse pooled connections instead of opening a new one each time
+_llm_session = make_http_session(pool_connections=1, pool_maxsize=16)
+
 class TrackingLLMClient:
     """Client for interacting with the LLM via Ollama with request tracking"""
     
@@ -45,19 +50,20 @@ class TrackingLLMClient:
             db.commit()
             
             try:
-                response = requests.post(
+                response = _llm_session.post(
                     f"{self.base_url}/api/generate",
-                    json={
+                    data=orjson.dumps({
                         "model": self.model,
                         "prompt": prompt,
                         "stream": False,
                         "options": {
                             "temperature": 0.7,
                         }
-                    },
+                    }),
+                    timeout=LLM_TIMEOUT_S
                 )
                 response.raise_for_status()
-                result = response.json()["response"]
+                result = orjson.loads(response.content)["response"]
                 
                 # Update request as completed
                 llm_request.status = LLMRequestStatus.COMPLETED
@@ -92,9 +98,9 @@ class LLMClient:
     def generate(self, prompt: str, max_tokens: int = 2000) -> str:
         """Generate text using the LLM"""
         try:
-            response = requests.post(
+            response = _llm_session.post(
                 f"{self.base_url}/api/generate",
-                json={
+                data=orjson.dumps({
                     "model": self.model,
                     "prompt": prompt,
                     "stream": False,
@@ -103,11 +109,11 @@ class LLMClient:
                 #       "top_p": 0.9,
                 #       "max_tokens": max_tokens
                     }
-                },
-                #timeout=60
+                }),
+                timeout=LLM_TIMEOUT_S
             )
             response.raise_for_status()
-            return response.json()["response"]
+            return orjson.loads(response.content)["response"]
         except Exception as e:
             self.logger.error("LLM API error: %s", e)
             raise e
@@ -1,8 +1,9 @@
 import uuid
 import json
-import requests
+import orjson
 import logging
 import time
+import re
 from requests.exceptions import (
     ReadTimeout,
     ConnectTimeout,
@@ -20,6 +21,25 @@ from models import (
 from celery_app import celery_app
 from datetime import datetime
 from logging_config import get_file_logger
+from http_client import make_http_session, LLM_TIMEOUT_S
+
+# Shared keep-alive session for MCP server calls so repeated tool requests
+# reuse pooled connections instead of opening a new one each time
+_mcp_session = make_http_session(pool_connections=8, pool_maxsize=32)
+
+# Same for the Ollama host: every plan step makes several generate calls
+_llm_session = make_http_session(pool_connections=1, pool_maxsize=16)
+
+# Keyword groups for the tool-selection fallback, each compiled into a single
+# alternation so a step description is scanned once per group
+_FINANCIAL_KEYWORDS_RE = re.compile("|".join(map(re.escape, [
+    'financial', 'earnings', 'revenue', 'profit', 'income', 'margin', 'ratio', '10-k', '10k',
+    'quarterly', 'annual', 'sec', 'filing', 'performance', 'growth', 'market share'])))
+_DOCUMENT_KEYWORDS_RE = re.compile("|".join(map(re.escape, [
+    'section', 'risk', 'management', 'business', 'overview', 'discussion', 'compensation',
+    'strategy', 'competition', 'market', 'industry'])))
+_SEC_KEYWORDS_RE = re.compile("|".join(map(re.escape, [
+    'available', 'companies', 'filings', 'sec', 'data', 'concepts', 'available concepts'])))
 
 class MCPClient:
     """Client for interacting with the MCP server"""
@@ -31,9 +51,9 @@ class MCPClient:
     def get_manifest(self):
         """Get the MCP server manifest"""
         try:
-            response = requests.get(f"{self.base_url}/manifest")
+            response = _mcp_session.get(f"{self.base_url}/manifest", timeout=30)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             self.logger.error("MCP manifest error: %s", e)
             return None
@@ -41,16 +61,17 @@ class MCPClient:
     def search(self, query: str, tool_name: str = None, max_results: int = 10):
         """Search for data using the MCP server"""
         try:
-            response = requests.post(
+            response = _mcp_session.post(
                 f"{self.base_url}/search",
-                json={
+                data=orjson.dumps({
                     "query": query,
                     "tool_name": tool_name,
                     "max_results": max_results
-                }
+                }),
+                timeout=60
             )
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             self.logger.error("MCP search error: %s", e)
             return {"results": [], "total_count": 0}
@@ -97,7 +118,7 @@ class TrackingMCPClient:
                     dossier_id,
                     step_id,
                 )
-                response = requests.get(url, timeout=timeout_s)
+                response = _mcp_session.get(url, timeout=timeout_s)
                 elapsed = time.time() - start_time
                 self.logger.info(
                     "GET %s completed status=%s elapsed=%.2fs bytes=%d",
@@ -107,11 +128,11 @@ class TrackingMCPClient:
                     len(getattr(response, "content", b"")),
                 )
                 response.raise_for_status()
-                result = response.json()
+                result = orjson.loads(response.content)
                 
                 # Update request as completed
                 tool_request.status = ToolRequestStatus.COMPLETED
-                tool_request.response = json.dumps(result)
+                tool_request.response = orjson.dumps(result).decode()
                 tool_request.completed_at = datetime.utcnow()
                 db.commit()
                 
@@ -238,12 +259,12 @@ class TrackingMCPClient:
                         step_id,
                         params,
                     )
-                    response = requests.post(
+                    response = _mcp_session.post(
                         url,
-                        json={
+                        data=orjson.dumps({
                             "tool_name": tool_name,
                             "parameters": params
-                        },
+                        }),
                         timeout=timeout_s
                     )
                 elif tool_name == "xbrl_financial_fact_retriever":
@@ -261,12 +282,12 @@ class TrackingMCPClient:
                         step_id,
                         params,
                     )
-                    response = requests.post(
+                    response = _mcp_session.post(
                         url,
-                        json={
+                        data=orjson.dumps({
                             "tool_name": tool_name,
                             "parameters": params
-                        },
+                        }),
                         timeout=timeout_s
                     )
                 elif tool_name in ["sec_data_tool", "xbrl_available_concepts_retriever"]:
@@ -283,12 +304,12 @@ class TrackingMCPClient:
                         step_id,
                         query[:200],
                     )
-                    response = requests.post(
+                    response = _mcp_session.post(
                         url,
-                        json={
+                        data=orjson.dumps({
                             "tool_name": tool_name,
                             "parameters": {"query": query}
-                        },
+                        }),
                         timeout=timeout_s
                     )
                 else:
@@ -314,11 +335,11 @@ class TrackingMCPClient:
                     )
                 
                 response.raise_for_status()
-                result = response.json()
+                result = orjson.loads(response.content)
                 
                 # Update request as completed
                 tool_request.status = ToolRequestStatus.COMPLETED
-                tool_request.response = json.dumps(result)
+                tool_request.response = orjson.dumps(result).decode()
                 tool_request.completed_at = datetime.utcnow()
                 db.commit()
                 
@@ -582,19 +603,20 @@ class TrackingLLMClient:
             db.commit()
             
             try:
-                response = requests.post(
+                response = _llm_session.post(
                     f"{self.base_url}/api/generate",
-                    json={
+                    data=orjson.dumps({
                         "model": self.model,
                         "prompt": prompt,
                         "stream": False,
                         "options": {
                             "temperature": 0.7,
                         }
-                    }
+                    }),
+                    timeout=LLM_TIMEOUT_S
                 )
                 response.raise_for_status()
-                result = response.json()["response"]
+                result = orjson.loads(response.content)["response"]
                 
                 # Update request as completed
                 llm_request.status = LLMRequestStatus.COMPLETED
@@ -629,19 +651,20 @@ class LLMClient:
     def generate(self, prompt: str, max_tokens: int = 2000) -> str:
         """Generate text using the LLM"""
         try:
-            response = requests.post(
+            response = _llm_session.post(
                 f"{self.base_url}/api/generate",
-                json={
+                data=orjson.dumps({
                     "model": self.model,
                     "prompt": prompt,
                     "stream": False,
                     "options": {
                         "temperature": 0.7,
                     }
-                }
+                }),
+                timeout=LLM_TIMEOUT_S
             )
             response.raise_for_status()
-            return response.json()["response"]
+            return orjson.loads(response.content)["response"]
         except Exception as e:
             self.logger.error("LLM API error: %s", e)
             raise e
@@ -852,22 +875,19 @@ Selected tool:"""
         step_lower = step_description.lower()
         
         # Check for financial/10-K related keywords - prioritize XBRL for numerical data
-        financial_keywords = ['financial', 'earnings', 'revenue', 'profit', 'income', 'margin', 'ratio', '10-k', '10k', 'quarterly', 'annual', 'sec', 'filing', 'performance', 'growth', 'market share']
-        if any(keyword in step_lower for keyword in financial_keywords):
+        if _FINANCIAL_KEYWORDS_RE.search(step_lower):
             if 'xbrl_financial_fact_retriever' in available_tool_names:
                 return 'xbrl_financial_fact_retriever'
             elif 'document_section_retriever' in available_tool_names:
                 return 'document_section_retriever'
         
         # Check for document/section related keywords
-        document_keywords = ['section', 'risk', 'management', 'business', 'overview', 'discussion', 'compensation', 'strategy', 'competition', 'market', 'industry']
-        if any(keyword in step_lower for keyword in document_keywords):
+        if _DOCUMENT_KEYWORDS_RE.search(step_lower):
             if 'document_section_retriever' in available_tool_names:
                 return 'document_section_retriever'
         
         # Check for SEC/data availability keywords
-        sec_keywords = ['available', 'companies', 'filings', 'sec', 'data', 'concepts', 'available concepts']
-        if any(keyword in step_lower for keyword in sec_keywords):
+        if _SEC_KEYWORDS_RE.search(step_lower):
             if 'sec_data_tool' in available_tool_names:
                 return 'sec_data_tool'
             elif 'xbrl_available_concepts_retriever' in available_tool_names:
@@ -959,11 +979,17 @@ Query:"""
         step_start_time = time.time()
         self.logger.info("Starting step execution: %s...", step.description[:100])
         
-        # Get the job ID for tracking
+        # Read what the MCP/LLM phase needs up front, then end the read
+        # transaction so the session does not hold a pooled connection open
+        # across the network calls below
         job_id = dossier.job_id
+        dossier_id = dossier.id
+        step_id = step.id
+        step_description = step.description
+        db.commit()
         
         # Get available tools from MCP server with tracking
-        manifest = self.mcp_client.get_manifest(job_id, dossier.id, step.id)
+        manifest = self.mcp_client.get_manifest(job_id, dossier_id, step_id)
         if not manifest:
             # Fallback to default tools if MCP server is unavailable
             available_tools = [
@@ -976,31 +1002,32 @@ Query:"""
             available_tools = manifest.get("tools", [])
         
         # Step 1: Check for Direct Data (Deductive Proxy Framework)
-        direct_data_available = self.check_for_direct_data(step.description, available_tools)
+        direct_data_available = self.check_for_direct_data(step_description, available_tools)
         
         if not direct_data_available:
             # Step 1a: Identify Data Gap
-            data_gap = self.identify_data_gap(step.description, available_tools, job_id, dossier.id)
+            data_gap = self.identify_data_gap(step_description, available_tools, job_id, dossier_id)
             step.data_gap_identified = data_gap
             
             # Step 1b: Formulate Proxy Hypothesis
-            proxy_hypothesis = self.formulate_proxy_hypothesis(step.description, data_gap, job_id, dossier.id)
+            proxy_hypothesis = self.formulate_proxy_hypothesis(step_description, data_gap, job_id, dossier_id)
             step.proxy_hypothesis = proxy_hypothesis
             
             # Step 1c: Update step description to focus on the proxy
             proxy_description = f"Find evidence for proxy: {proxy_hypothesis['observable_proxy']}"
-            step.description = f"{step.description} (using proxy: {proxy_hypothesis['observable_proxy']})"
+            step_description = f"{step_description} (using proxy: {proxy_hypothesis['observable_proxy']})"
+            step.description = step_description
         
         # Step 2: Tool Selection
-        tool_name = self.select_tool(step.description, available_tools, job_id, dossier.id)
-        tool_selection_justification = f"Selected {tool_name} because it is most appropriate for: {step.description}"
+        tool_name = self.select_tool(step_description, available_tools, job_id, dossier_id)
+        tool_selection_justification = f"Selected {tool_name} because it is most appropriate for: {step_description}"
         
         # Step 3: Query Formulation
-        query = self.formulate_query(step.description, tool_name, job_id, dossier.id)
-        tool_query_rationale = f"Formulated query '{query}' to gather evidence for: {step.description}"
+        query = self.formulate_query(step_description, tool_name, job_id, dossier_id)
+        tool_query_rationale = f"Formulated query '{query}' to gather evidence for: {step_description}"
         
         # Step 4: Execute the search with tracking
-        search_results = self.mcp_client.search(query, tool_name, job_id, dossier.id, step.id)
+        search_results = self.mcp_client.search(query, tool_name, job_id, dossier_id, step_id)
         
         # Step 5: Update the step with results and justifications
         step.tool_used = tool_name
@@ -1,11 +1,93 @@
 import os
 import re
+import functools
 import json
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional, Any
 import requests
 from datetime import datetime
 
+# Common 10-K section headers with variations, compiled once
+_SECTION_HEADER_PATTERNS = {
+    section_name: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    for section_name, patterns in {
+        "1": [r"item\s*1[^a-zA-Z]*", r"business\s*overview", r"business\s*description"],
+        "1A": [r"item\s*1a[^a-zA-Z]*", r"risk\s*factors?", r"risk\s*factor"],
+        "2": [r"item\s*2[^a-zA-Z]*", r"properties"],
+        "3": [r"item\s*3[^a-zA-Z]*", r"legal\s*proceedings"],
+        "4": [r"item\s*4[^a-zA-Z]*", r"mine\s*safety"],
+        "5": [r"item\s*5[^a-zA-Z]*", r"market", r"market\s*for\s*registrant"],
+        "6": [r"item\s*6[^a-zA-Z]*", r"selected\s*financial\s*data"],
+        "7": [r"item\s*7[^a-zA-Z]*", r"management", r"management's\s*discussion"],
+        "7A": [r"item\s*7a[^a-zA-Z]*", r"quantitative\s*and\s*qualitative"],
+        "8": [r"item\s*8[^a-zA-Z]*", r"financial\s*statements"],
+        "9": [r"item\s*9[^a-zA-Z]*", r"changes\s*in\s*and\s*disagreements"],
+        "9A": [r"item\s*9a[^a-zA-Z]*", r"controls\s*and\s*procedures"],
+        "9B": [r"item\s*9b[^a-zA-Z]*", r"other\s*information"],
+        "10": [r"item\s*10[^a-zA-Z]*", r"directors", r"executive\s*officers"],
+        "11": [r"item\s*11[^a-zA-Z]*", r"executive\s*compensation"],
+        "12": [r"item\s*12[^a-zA-Z]*", r"security\s*ownership"],
+        "13": [r"item\s*13[^a-zA-Z]*", r"certain\s*relationships"],
+        "14": [r"item\s*14[^a-zA-Z]*", r"principal\s*accountant"],
+        "15": [r"item\s*15[^a-zA-Z]*", r"exhibits"]
+    }.items()
+}
+
+# Start of the next "Item N" header, used to find where a section ends
+_NEXT_ITEM_RE = re.compile(r"item\s*\d", re.IGNORECASE)
+
+# Section body patterns used by _find_section_improved, compiled once
+_SECTION_CONTENT_PATTERNS = {
+    section_name: [re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in patterns]
+    for section_name, patterns in {
+        "1": [
+            r"item\s*1[^a-zA-Z]*([^I]*?)(?=item\s*[2-9]|item\s*1[^a-zA-Z]|$)",
+            r"business\s*overview[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)",
+            r"business\s*description[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)"
+        ],
+        "1A": [
+            r"item\s*1a[^a-zA-Z]*([^I]*?)(?=item\s*[2-9]|item\s*1[^a-zA-Z]|$)",
+            r"risk\s*factors?[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)",
+            r"risk\s*factor[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)"
+        ],
+        "7": [
+            r"item\s*7[^a-zA-Z]*([^I]*?)(?=item\s*[8-9]|item\s*7[^a-zA-Z]|$)",
+            r"management's\s*discussion[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)",
+            r"management\s*discussion[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)"
+        ],
+        "1B": [
+            r"item\s*1b[^a-zA-Z]*([^I]*?)(?=item\s*[2-9]|item\s*1[^a-zA-Z]|$)",
+            r"unresolved\s*staff\s*comments[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)"
+        ]
+    }.items()
+}
+
+@functools.lru_cache(maxsize=64)
+def _general_section_patterns(section: str) -> List[re.Pattern]:
+    """Fallback patterns for an arbitrary section name, compiled once per name"""
+    return [
+        re.compile(pattern, re.IGNORECASE | re.DOTALL)
+        for pattern in (
+            rf"{section}[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)",
+            rf"item\s*{section}[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)",
+            rf"section\s*{section}[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)"
+        )
+    ]
+
+# Terms that mark a table as financial, matched in one case-insensitive pass
+_FINANCIAL_TABLE_RE = re.compile(r"revenue|income|assets|liabilities|cash", re.IGNORECASE)
+
+@functools.lru_cache(maxsize=8)
+def _filing_text(file_path: str, mtime: float) -> str:
+    """
+    Visible text of a filing, memoized on (file_path, mtime) so repeated section
+    lookups against the same 10-K don't re-read and re-parse the HTML.
+    """
+    # Hand lxml the raw bytes so it decodes in C, instead of building a
+    # decoded copy of the whole file in Python first
+    with open(file_path, 'rb') as f:
+        return BeautifulSoup(f, 'lxml', from_encoding='utf-8').get_text()
+
 class SEC10KParser:
     """Parser for SEC 10-K filings"""
     
@@ -62,10 +144,12 @@ class SEC10KParser:
             return {"error": f"Filing not found for {company} {year}"}
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                soup = BeautifulSoup(f, 'lxml', from_encoding='utf-8')
             
-            soup = BeautifulSoup(content, 'html.parser')
+            # Only the head of the document is kept as raw content
+            with open(file_path, 'r', encoding='utf-8') as f:
+                raw_content = f.read(10000)
             
             # Extract basic filing info
             filing_info = self._extract_filing_info(soup)
@@ -82,7 +166,7 @@ class SEC10KParser:
                 "filing_info": filing_info,
                 "sections": sections,
                 "financial_data": financial_data,
-                "raw_content": content[:10000]  # First 10k chars for reference
+                "raw_content": raw_content  # First 10k chars for reference
             }
             
         except Exception as e:
@@ -95,13 +179,8 @@ class SEC10KParser:
             return {"error": f"Filing not found for {company} {year}"}
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            soup = BeautifulSoup(content, 'html.parser')
-            
             # Get the full text content
-            full_text = soup.get_text()
+            full_text = _filing_text(file_path, os.path.getmtime(file_path))
             
             # Try to find the section using various patterns
             section_content = self._find_section_improved(full_text, section)
@@ -152,42 +231,20 @@ class SEC10KParser:
         """Extract all major sections"""
         sections = {}
         
-        # Common section headers with variations
-        section_patterns = {
-            "1": [r"item\s*1[^a-zA-Z]*", r"business\s*overview", r"business\s*description"],
-            "1A": [r"item\s*1a[^a-zA-Z]*", r"risk\s*factors?", r"risk\s*factor"],
-            "2": [r"item\s*2[^a-zA-Z]*", r"properties"],
-            "3": [r"item\s*3[^a-zA-Z]*", r"legal\s*proceedings"],
-            "4": [r"item\s*4[^a-zA-Z]*", r"mine\s*safety"],
-            "5": [r"item\s*5[^a-zA-Z]*", r"market", r"market\s*for\s*registrant"],
-            "6": [r"item\s*6[^a-zA-Z]*", r"selected\s*financial\s*data"],
-            "7": [r"item\s*7[^a-zA-Z]*", r"management", r"management's\s*discussion"],
-            "7A": [r"item\s*7a[^a-zA-Z]*", r"quantitative\s*and\s*qualitative"],
-            "8": [r"item\s*8[^a-zA-Z]*", r"financial\s*statements"],
-            "9": [r"item\s*9[^a-zA-Z]*", r"changes\s*in\s*and\s*disagreements"],
-            "9A": [r"item\s*9a[^a-zA-Z]*", r"controls\s*and\s*procedures"],
-            "9B": [r"item\s*9b[^a-zA-Z]*", r"other\s*information"],
-            "10": [r"item\s*10[^a-zA-Z]*", r"directors", r"executive\s*officers"],
-            "11": [r"item\s*11[^a-zA-Z]*", r"executive\s*compensation"],
-            "12": [r"item\s*12[^a-zA-Z]*", r"security\s*ownership"],
-            "13": [r"item\s*13[^a-zA-Z]*", r"certain\s*relationships"],
-            "14": [r"item\s*14[^a-zA-Z]*", r"principal\s*accountant"],
-            "15": [r"item\s*15[^a-zA-Z]*", r"exhibits"]
-        }
-        
         text = soup.get_text()
         
-        for section_name, patterns in section_patterns.items():
+        for section_name, patterns in _SECTION_HEADER_PATTERNS.items():
             for pattern in patterns:
                 # Look for section content
-                section_match = re.search(pattern, text, re.IGNORECASE)
+                section_match = pattern.search(text)
                 if section_match:
                     # Try to extract content after the section header
                     start_pos = section_match.end()
-                    # Look for next section or end of document
-                    next_section = re.search(r"item\s*\d", text[start_pos:], re.IGNORECASE)
+                    # Look for next section or end of document, searching in
+                    # place rather than on a copy of the rest of the text
+                    next_section = _NEXT_ITEM_RE.search(text, start_pos)
                     if next_section:
-                        end_pos = start_pos + next_section.start()
+                        end_pos = next_section.start()
                     else:
                         end_pos = len(text)
                     
@@ -207,8 +264,7 @@ class SEC10KParser:
         
         for table in tables:
             # Look for common financial terms
-            table_text = table.get_text().lower()
-            if any(term in table_text for term in ['revenue', 'income', 'assets', 'liabilities', 'cash']):
+            if _FINANCIAL_TABLE_RE.search(table.get_text()):
                 # Extract table data
                 rows = table.find_all('tr')
                 for row in rows:
@@ -224,33 +280,10 @@ class SEC10KParser:
     def _find_section_improved(self, text: str, section: str) -> Optional[str]:
         """Improved section finding with multiple patterns"""
         
-        # Map section names to search patterns
-        section_patterns = {
-            "1": [
-                r"item\s*1[^a-zA-Z]*([^I]*?)(?=item\s*[2-9]|item\s*1[^a-zA-Z]|$)",
-                r"business\s*overview[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)",
-                r"business\s*description[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)"
-            ],
-            "1A": [
-                r"item\s*1a[^a-zA-Z]*([^I]*?)(?=item\s*[2-9]|item\s*1[^a-zA-Z]|$)",
-                r"risk\s*factors?[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)",
-                r"risk\s*factor[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)"
-            ],
-            "7": [
-                r"item\s*7[^a-zA-Z]*([^I]*?)(?=item\s*[8-9]|item\s*7[^a-zA-Z]|$)",
-                r"management's\s*discussion[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)",
-                r"management\s*discussion[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)"
-            ],
-            "1B": [
-                r"item\s*1b[^a-zA-Z]*([^I]*?)(?=item\s*[2-9]|item\s*1[^a-zA-Z]|$)",
-                r"unresolved\s*staff\s*comments[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)"
-            ]
-        }
-        
-        patterns = section_patterns.get(section, [rf"{section}[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)"])
+        patterns = _SECTION_CONTENT_PATTERNS.get(section) or _general_section_patterns(section)[:1]
         
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+            match = pattern.search(text)
             if match:
                 content = match.group(1).strip()
                 if len(content) > 100:
@@ -258,14 +291,8 @@ class SEC10KParser:
         
         # If no match found, try a more general approach
         # Look for any mention of the section
-        general_patterns = [
-            rf"{section}[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)",
-            rf"item\s*{section}[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)",
-            rf"section\s*{section}[^a-zA-Z]*([^I]*?)(?=item\s*\d|$)"
-        ]
-        
-        for pattern in general_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        for pattern in _general_section_patterns(section):
+            match = pattern.search(text)
             if match:
                 content = match.group(1).strip()
                 if len(content) > 100:
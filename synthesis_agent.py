@@ -7,8 +7,8 @@ Thesis and Antithesis dossiers into a single coherent narrative.
 """
 
 import json
+import orjson
 import uuid
-import requests
 import logging
 from datetime import datetime
 from typing import Dict, Any, List
@@ -17,6 +17,11 @@ from sqlalchemy.orm import Session
 from models import SessionLocal, Job, EvidenceDossier, SynthesisReport, LLMRequest, LLMRequestStatus, LLMRequestType
 from celery_app import celery_app
 from logging_config import get_file_logger
+from http_client import make_http_session, SYNTHESIS_TIMEOUT_S
+
+# Shared keep-alive session for Ollama calls, reused across synthesis tasks
+# handled by the same worker process
+_llm_session = make_http_session(pool_connections=1, pool_maxsize=16)
 
 class SynthesisAgent:
     """Agent responsible for generating the final balanced report"""
@@ -104,10 +109,10 @@ Your response should be comprehensive but concise, typically 800-1200 words."""
         }
         
         try:
-            response = requests.post(self.llm_url, json=payload, timeout=120)
+            response = _llm_session.post(self.llm_url, data=orjson.dumps(payload), timeout=SYNTHESIS_TIMEOUT_S)
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             return result.get("response", "")
             
         except Exception as e:
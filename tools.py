@@ -3,199 +3,409 @@ import json
 import uuid
 import os
 import re
+import time
+import functools
+import itertools
+import mmap
+import hashlib
+import pickle
+import sys
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, DefaultDict, Any, List, Optional
 from pathlib import Path
-from bs4 import BeautifulSoup
+import lxml.etree
+
+from config import config
 
 # Import the real SEC parser
 from sec_parser import get_10k_section, get_10k_filing, get_available_companies, get_available_years
 
-# Import the existing LLM client
-from orchestrator_agent import TrackingLLMClient
+# Map symbol to company directory name
+_COMPANY_MAP = MappingProxyType({
+    "AAPL": "AAPL",
+    "MSFT": "MSFT",
+    "GOOGL": "GOOGL",
+    "AMZN": "AMZN",
+    "TSLA": "TSLA"
+})
+
+# Map common financial terms to their XBRL concept names
+_CONCEPT_MAPPING = MappingProxyType({
+    "Revenue": "us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax",
+    "NetIncome": "us-gaap:NetIncomeLoss",
+    "GrossProfit": "us-gaap:GrossProfit",
+    "TotalAssets": "us-gaap:Assets",
+    "TotalLiabilities": "us-gaap:Liabilities",
+    "CashAndCashEquivalents": "us-gaap:CashAndCashEquivalentsAtCarryingValue",
+    "PropertyPlantAndEquipmentNet": "us-gaap:PropertyPlantAndEquipmentNet",
+    "Goodwill": "us-gaap:Goodwill",
+    "IntangibleAssetsNet": "us-gaap:IntangibleAssetsNet",
+    "AccountsReceivableNet": "us-gaap:AccountsReceivableNetCurrent",
+    "InventoryNet": "us-gaap:InventoryNet",
+    "OperatingIncome": "us-gaap:OperatingIncomeLoss",
+    "OperatingExpenses": "us-gaap:OperatingExpenses",
+    "ResearchAndDevelopmentExpense": "us-gaap:ResearchAndDevelopmentExpense",
+    "SellingGeneralAndAdministrativeExpense": "us-gaap:SellingGeneralAndAdministrativeExpense",
+    "InterestExpense": "us-gaap:InterestExpense",
+    "IncomeTaxExpense": "us-gaap:IncomeTaxExpenseBenefit",
+    "EarningsPerShareBasic": "us-gaap:EarningsPerShareBasic",
+    "EarningsPerShareDiluted": "us-gaap:EarningsPerShareDiluted",
+    "WeightedAverageNumberOfSharesOutstandingBasic": "us-gaap:WeightedAverageNumberOfSharesOutstandingBasic",
+    "WeightedAverageNumberOfSharesOutstandingDiluted": "us-gaap:WeightedAverageNumberOfSharesOutstandingDiluted",
+    "CommonStockValue": "us-gaap:CommonStockValue",
+    "RetainedEarnings": "us-gaap:RetainedEarningsAccumulatedDeficit",
+    "TotalStockholdersEquity": "us-gaap:StockholdersEquity",
+    "NetCashProvidedByOperatingActivities": "us-gaap:NetCashProvidedByUsedInOperatingActivities",
+    "NetCashUsedInInvestingActivities": "us-gaap:NetCashUsedInProvidedByInvestingActivities",
+    "NetCashUsedInFinancingActivities": "us-gaap:NetCashUsedInProvidedByFinancingActivities"
+})
+
+# Common financial concept names surfaced by get_available_financial_concepts
+_COMMON_CONCEPTS = (
+    "Revenue", "NetIncome", "GrossProfit", "TotalAssets", "TotalLiabilities",
+    "CashAndCashEquivalents", "PropertyPlantAndEquipmentNet", "Goodwill",
+    "IntangibleAssetsNet", "AccountsReceivableNet", "InventoryNet",
+    "OperatingIncome", "OperatingExpenses", "ResearchAndDevelopmentExpense",
+    "SellingGeneralAndAdministrativeExpense", "InterestExpense", "IncomeTaxExpense",
+    "EarningsPerShareBasic", "EarningsPerShareDiluted", "WeightedAverageNumberOfSharesOutstandingBasic",
+    "WeightedAverageNumberOfSharesOutstandingDiluted", "CommonStockValue",
+    "RetainedEarnings", "TotalStockholdersEquity", "NetCashProvidedByOperatingActivities",
+    "NetCashUsedInInvestingActivities", "NetCashUsedInFinancingActivities"
+)
+# Single alternation so each concept name is scanned once for any common term
+_COMMON_CONCEPTS_RE = re.compile("|".join(map(re.escape, _COMMON_CONCEPTS)))
+
+# Root of the downloaded SEC filings, laid out as <company>/10-K_<year>.html
+SEC_FORMS_PATH = "/mnt/d/Orca/Data/sec_forms"
+# How often the filing index is rebuilt in long-running processes
+FILING_INDEX_REFRESH_S = 60
+
+_filing_index: Dict[tuple, str] = {}
+_filing_index_built_at = float("-inf")
+
+def _build_filing_index() -> Dict[tuple, str]:
+    """Scan SEC_FORMS_PATH once and map (company, year) to the 10-K file path"""
+    index = {}
+    try:
+        companies = os.scandir(SEC_FORMS_PATH)
+    except OSError:
+        return index
+    
+    # scandir reuses the directory entry types, avoiding a stat per file
+    with companies:
+        for company in companies:
+            if not company.is_dir():
+                continue
+            try:
+                with os.scandir(company.path) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if not (name.startswith("10-K_") and name.endswith(".html")):
+                            continue
+                        try:
+                            year = int(name[len("10-K_"):-len(".html")])
+                        except ValueError:
+                            continue
+                        index[(company.name, year)] = entry.path
+            except OSError:
+                continue
+    return index
+
+def refresh_filing_index() -> None:
+    """Rescan SEC_FORMS_PATH, e.g. after new filings have been downloaded"""
+    global _filing_index, _filing_index_built_at
+    _filing_index = _build_filing_index()
+    _filing_index_built_at = time.monotonic()
+
+def find_filing_path(company: str, year: int) -> Optional[str]:
+    """Return the 10-K path for a company/year, or None if there is no such filing"""
+    if time.monotonic() - _filing_index_built_at > FILING_INDEX_REFRESH_S:
+        refresh_filing_index()
+    try:
+        return _filing_index.get((company, int(year)))
+    except (TypeError, ValueError):
+        return None
+
+def _is_fin_num(text: str) -> bool:
+    """
+    Return True if a table cell looks like a financial number, e.g. "$1,234.5".
+    Hand-rolled equivalent of r'^\$?[\d,]+\.?\d*$' that avoids the regex engine.
+    """
+    if text[:1] == '$':
+        text = text[1:]
+    head, _, tail = text.partition('.')
+    if not head:
+        return False
+    digits = head.replace(',', '')
+    return (not digits or digits.isdecimal()) and (not tail or tail.isdecimal())
+
+# Field order of the compact fact tuples stored by parse_ixbrl_filing
+_FACT_FIELDS = ("value", "context", "unit", "tag_type")
+
+def fact_to_dict(fact: tuple) -> Dict[str, Any]:
+    """Expand a (value, context, unit, tag_type) fact tuple into a dict"""
+    return dict(zip(_FACT_FIELDS, fact))
+
+# ix:* fact elements; the HTML parser keeps the prefixed tag name verbatim
+_IX_FACT_TAGS = ('ix:nonnumeric', 'ix:nonfraction')
+# Byte-level probe for any ix:* fact tag, run before parsing
+_IX_FACT_OPEN_RE = re.compile(rb'<ix:non(?:numeric|fraction)\b', re.IGNORECASE)
+
+def _has_ix_facts(file_path: str) -> bool:
+    """Cheaply check whether a filing contains inline XBRL fact tags at all"""
+    with open(file_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _IX_FACT_OPEN_RE.search(mm) is not None
+
+def _node_text(node) -> str:
+    """lxml equivalent of BeautifulSoup's get_text(strip=True)"""
+    # Most cells and facts hold a single text node; skip the subtree walk
+    if len(node) == 0:
+        return (node.text or '').strip()
+    return ''.join(text.strip() for text in node.itertext())
+
+def _release(elem) -> None:
+    """Free an element handled by iterparse along with its already-seen siblings"""
+    elem.clear(keep_tail=True)
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
 
-def parse_ixbrl_filing(file_path: str) -> Dict[str, Any]:
+def _collect_row_facts(row, facts: DefaultDict[str, list]) -> None:
+    """Pair each number in a visible table row with the closest preceding text cell"""
+    last_label = None
+    for cell in row.iter('td', 'th'):
+        # Look for cells that might contain financial data
+        text = _node_text(cell)
+        if not text:
+            continue
+        # Cheap first-character check skips the classifier for word cells
+        if text[0] not in '$0123456789' or not _is_fin_num(text):
+            last_label = text
+            continue
+        # This looks like a financial number
+        if last_label is not None:
+            facts[last_label].append(
+                (text, "visible_table", "USD", "table_cell")
+            )
+
+def parse_ixbrl_filing(file_path: str, full_scan: bool = False) -> Dict[str, Any]:
     """
-    Parse an iXBRL filing using BeautifulSoup and extract financial facts
+    Stream-parse an iXBRL filing with lxml iterparse and extract financial facts.
+    Facts are stored as (value, context, unit, tag_type) tuples; see fact_to_dict.
+    Visible table cells are only scanned when full_scan is set or the filing
+    has no ix:* facts at all.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # Extract facts from ix:nonnumeric and ix:nonfraction tags
-        facts = {}
+        # defaultdict avoids a setdefault call per fact; converted back to a
+        # plain dict before returning so callers can't grow it by lookup
+        facts = defaultdict(list)
         contexts = {}
         
-        # Find all ix:nonnumeric tags (text facts)
-        for tag in soup.find_all(['ix:nonnumeric', 'ix:nonfraction']):
-            if tag.get('name') and tag.get('contextref'):
-                concept_name = tag.get('name')
-                context_ref = tag.get('contextref')
-                value = tag.get_text(strip=True)
-                unit = tag.get('unitref')
-                
-                # Store context information
-                if context_ref not in contexts:
-                    contexts[context_ref] = {
-                        "context_id": context_ref,
-                        "unit": unit
-                    }
+        # Filings without inline XBRL only have the visible tables to go on,
+        # so go straight to the full scan instead of a wasted ix:* pass
+        if not full_scan and not _has_ix_facts(file_path):
+            full_scan = True
+        
+        # Only elements we extract from raise events; handled elements are
+        # released as we go so the full DOM is never resident. Nothing inside
+        # an ix:* element is released before that element ends (text blocks
+        # nest facts and tables), and for a full scan ix:* elements stay
+        # intact until their enclosing table row has been read.
+        tags = _IX_FACT_TAGS + ('tr',) if full_scan else _IX_FACT_TAGS
+        ix_depth = 0
+        with open(file_path, 'rb') as f:
+            for event, elem in lxml.etree.iterparse(
+                f,
+                events=('start', 'end'),
+                tag=tags,
+                html=True,
+                encoding='utf-8',
+                huge_tree=True,
+                remove_comments=True,
+                remove_pis=True,
+                remove_blank_text=True,
+                collect_ids=False
+            ):
+                if elem.tag == 'tr':
+                    if event == 'end':
+                        # Also look for numeric facts in the visible HTML
+                        # These are often in tables with financial data
+                        _collect_row_facts(elem, facts)
+                        if not ix_depth:
+                            _release(elem)
+                    continue
                 
-                # Store fact
-                if concept_name not in facts:
-                    facts[concept_name] = []
+                if event == 'start':
+                    ix_depth += 1
+                    continue
+                ix_depth -= 1
                 
-                facts[concept_name].append({
-                    "value": value,
-                    "context": context_ref,
-                    "unit": unit,
-                    "tag_type": tag.name
-                })
+                # Extract facts from ix:nonnumeric and ix:nonfraction tags
+                concept_name = elem.get('name')
+                context_ref = elem.get('contextref')
+                if concept_name and context_ref:
+                    # Names, context refs and units repeat thousands of times per
+                    # filing; interning keeps one copy of each in the cached result
+                    concept_name = sys.intern(concept_name)
+                    context_ref = sys.intern(context_ref)
+                    value = _node_text(elem)
+                    unit = elem.get('unitref')
+                    if unit:
+                        unit = sys.intern(unit)
+                    
+                    # Store context information
+                    if context_ref not in contexts:
+                        contexts[context_ref] = {
+                            "context_id": context_ref,
+                            "unit": unit
+                        }
+                    
+                    # Store fact; lxml hands back a fresh tag string per element
+                    facts[concept_name].append(
+                        (value, context_ref, unit, sys.intern(elem.tag))
+                    )
+                if not full_scan and not ix_depth:
+                    _release(elem)
+        
+        # ix:* tags were present but none carried a usable name/contextref
+        if not facts and not full_scan:
+            return parse_ixbrl_filing(file_path, full_scan=True)
         
-        # Also look for numeric facts in the visible HTML
-        # These are often in tables with financial data
-        for table in soup.find_all('table'):
-            for row in table.find_all('tr'):
-                cells = row.find_all(['td', 'th'])
-                for cell in cells:
-                    # Look for cells that might contain financial data
-                    text = cell.get_text(strip=True)
-                    if text and re.match(r'^\$?[\d,]+\.?\d*$', text):
-                        # This looks like a financial number
-                        # Try to find a label in nearby cells
-                        for sibling in cell.find_previous_siblings():
-                            if sibling.get_text(strip=True):
-                                label = sibling.get_text(strip=True)
-                                if label not in facts:
-                                    facts[label] = []
-                                facts[label].append({
-                                    "value": text,
-                                    "context": "visible_table",
-                                    "unit": "USD",
-                                    "tag_type": "table_cell"
-                                })
-                                break
+        facts = dict(facts)
+        
+        # Index facts by namespace-free, lowercased concept name so lookups
+        # don't have to probe every prefix/case variation
+        concept_index = {}
+        for concept_name, concept_facts in facts.items():
+            key = concept_name.split(':')[-1].lower()
+            concept_index.setdefault(key, []).extend(concept_facts)
         
         return {
             "success": True,
             "facts": facts,
             "contexts": contexts,
+            "concept_index": concept_index,
+            "available_concepts_top20": list(facts)[:20],
+            # Common financial concepts present, for get_available_financial_concepts
+            "common_concepts": [c for c in facts if _COMMON_CONCEPTS_RE.search(c)],
             "filing_date": os.path.basename(file_path)
         }
         
     except Exception as e:
         return {"error": f"Error parsing iXBRL filing: {str(e)}"}
 
-def get_financial_fact(symbol: str, year: int, concept: str):
-    """Get financial fact from real iXBRL data"""
-    # Map symbol to company directory name
-    company_map = {
-        "AAPL": "AAPL",
-        "MSFT": "MSFT", 
-        "GOOGL": "GOOGL",
-        "AMZN": "AMZN",
-        "TSLA": "TSLA"
-    }
-    
-    # Map common financial terms to their XBRL concept names
-    concept_mapping = {
-        "Revenue": "us-gaap:RevenueFromContractWithCustomerExcludingAssessedTax",
-        "NetIncome": "us-gaap:NetIncomeLoss",
-        "GrossProfit": "us-gaap:GrossProfit",
-        "TotalAssets": "us-gaap:Assets",
-        "TotalLiabilities": "us-gaap:Liabilities",
-        "CashAndCashEquivalents": "us-gaap:CashAndCashEquivalentsAtCarryingValue",
-        "PropertyPlantAndEquipmentNet": "us-gaap:PropertyPlantAndEquipmentNet",
-        "Goodwill": "us-gaap:Goodwill",
-        "IntangibleAssetsNet": "us-gaap:IntangibleAssetsNet",
-        "AccountsReceivableNet": "us-gaap:AccountsReceivableNetCurrent",
-        "InventoryNet": "us-gaap:InventoryNet",
-        "OperatingIncome": "us-gaap:OperatingIncomeLoss",
-        "OperatingExpenses": "us-gaap:OperatingExpenses",
-        "ResearchAndDevelopmentExpense": "us-gaap:ResearchAndDevelopmentExpense",
-        "SellingGeneralAndAdministrativeExpense": "us-gaap:SellingGeneralAndAdministrativeExpense",
-        "InterestExpense": "us-gaap:InterestExpense",
-        "IncomeTaxExpense": "us-gaap:IncomeTaxExpenseBenefit",
-        "EarningsPerShareBasic": "us-gaap:EarningsPerShareBasic",
-        "EarningsPerShareDiluted": "us-gaap:EarningsPerShareDiluted",
-        "WeightedAverageNumberOfSharesOutstandingBasic": "us-gaap:WeightedAverageNumberOfSharesOutstandingBasic",
-        "WeightedAverageNumberOfSharesOutstandingDiluted": "us-gaap:WeightedAverageNumberOfSharesOutstandingDiluted",
-        "CommonStockValue": "us-gaap:CommonStockValue",
-        "RetainedEarnings": "us-gaap:RetainedEarningsAccumulatedDeficit",
-        "TotalStockholdersEquity": "us-gaap:StockholdersEquity",
-        "NetCashProvidedByOperatingActivities": "us-gaap:NetCashProvidedByUsedInOperatingActivities",
-        "NetCashUsedInInvestingActivities": "us-gaap:NetCashUsedInProvidedByInvestingActivities",
-        "NetCashUsedInFinancingActivities": "us-gaap:NetCashUsedInProvidedByFinancingActivities"
-    }
-    
-    # Use the mapping if the concept is a common term
-    if concept in concept_mapping:
-        concept = concept_mapping[concept]
-    
-    company = company_map.get(symbol.upper(), symbol.upper())
-    
-    # Construct the file path to the iXBRL filing
-    file_path = f"/mnt/d/Orca/Data/sec_forms/{company}/10-K_{year}.html"
-    
-    if not os.path.exists(file_path):
-        return {
-            "symbol": symbol,
-            "year": year,
-            "concept": concept,
-            "value": None,
-            "error": f"iXBRL filing not found: {file_path}",
-            "unit": "USD"
-        }
-    
-    # Parse the iXBRL filing
-    xbrl_data = parse_ixbrl_filing(file_path)
+# Bump when the shape of the parse result changes so stale sidecars are ignored
+_PARSE_CACHE_VERSION = 3
+
+def _sidecar_path(file_path: str, full_scan: bool) -> str:
+    return f"{file_path}.parsed{'-full' if full_scan else ''}.v{_PARSE_CACHE_VERSION}.pkl"
+
+def _file_digest(file_path: str) -> bytes:
+    """Content hash of a filing, used to validate sidecars whose mtime is stale"""
+    with open(file_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return hashlib.blake2b(mm, digest_size=16).digest()
+
+def _load_or_parse(file_path: str, full_scan: bool) -> Dict[str, Any]:
+    """
+    Parse a filing, going through an on-disk pickle sidecar when
+    config.PARSE_CACHE is enabled so other processes can skip the parse.
+    A sidecar older than the filing is still reused if the filing's content
+    hash is unchanged (e.g. the filing was re-copied or touched).
+    """
+    if not config.PARSE_CACHE:
+        return parse_ixbrl_filing(file_path, full_scan)
     
-    if "error" in xbrl_data:
-        return {
-            "symbol": symbol,
-            "year": year,
-            "concept": concept,
-            "value": None,
-            "error": xbrl_data["error"],
-            "unit": "USD"
-        }
+    sidecar = _sidecar_path(file_path, full_scan)
+    digest = None
+    try:
+        with open(sidecar, 'rb') as f:
+            cached_digest, cached_result = pickle.load(f)
+        if os.path.getmtime(sidecar) > os.path.getmtime(file_path):
+            return cached_result
+        digest = _file_digest(file_path)
+        if digest == cached_digest:
+            os.utime(sidecar)
+            return cached_result
+    except (OSError, TypeError, ValueError, pickle.UnpicklingError, EOFError):
+        pass
     
+    result = parse_ixbrl_filing(file_path, full_scan)
+    if "error" not in result:
+        # Write to a temp file and rename so readers never see a partial pickle
+        tmp_path = f"{sidecar}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if digest is None:
+                digest = _file_digest(file_path)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((digest, result), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, sidecar)
+        except (OSError, ValueError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return result
+
+class _ParseFailed(Exception):
+    """Carries a parse error result out of _parse_cached so lru_cache does not keep it"""
+    def __init__(self, result: Dict[str, Any]):
+        super().__init__(result.get("error"))
+        self.result = result
+
+@functools.lru_cache(maxsize=32)
+def _parse_cached(file_path: str, mtime: float, full_scan: bool) -> Dict[str, Any]:
+    """
+    Memoized parse_ixbrl_filing. The mtime is part of the key so a replaced
+    filing is re-parsed. The returned dict is shared - treat it as read-only.
+    Failed parses raise _ParseFailed instead, so they are retried next call.
+    """
+    result = _load_or_parse(file_path, full_scan)
+    if "error" in result:
+        raise _ParseFailed(result)
+    return result
+
+def load_ixbrl_filing(file_path: str, full_scan: bool = False) -> Dict[str, Any]:
+    """Parse an iXBRL filing, reusing the cached result if the file is unchanged"""
+    try:
+        return _parse_cached(file_path, os.path.getmtime(file_path), full_scan)
+    except _ParseFailed as e:
+        return e.result
+
+def _missing_fact(symbol: str, year: int, concept: str, error: str) -> Dict[str, Any]:
+    return {
+        "symbol": symbol,
+        "year": year,
+        "concept": concept,
+        "value": None,
+        "error": error,
+        "unit": "USD"
+    }
+
+def _find_fact(symbol: str, year: int, concept: str, file_path: str, xbrl_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Look one (already mapped) concept up in a parsed filing"""
     # Look for the specific concept in the facts
     facts = xbrl_data.get("facts", {})
     
-    # Try different variations of the concept name
-    concept_variations = [
-        concept,
-        f"us-gaap:{concept}",
-        f"aapl:{concept}",
-        concept.upper(),
-        concept.lower(),
-        f"dei:{concept}",
-        f"srt:{concept}"
-    ]
-    
-    found_facts = []
-    for concept_var in concept_variations:
-        if concept_var in facts:
-            found_facts.extend(facts[concept_var])
+    # Prefer an exact match, otherwise match the concept in any namespace/case
+    found_facts = facts.get(concept) or xbrl_data["concept_index"].get(concept.split(':')[-1].lower())
     
     if not found_facts:
         # Return available concepts for debugging
-        available_concepts = list(facts.keys())
-        return {
-            "symbol": symbol,
-            "year": year,
-            "concept": concept,
-            "value": None,
-            "error": f"Concept '{concept}' not found in iXBRL filing. Available concepts: {available_concepts[:10]}...",
-            "unit": "USD",
-            "available_concepts": available_concepts[:20]  # First 20 for reference
-        }
+        available_concepts = xbrl_data["available_concepts_top20"]
+        result = _missing_fact(
+            symbol, year, concept,
+            f"Concept '{concept}' not found in iXBRL filing. Available concepts: {available_concepts[:10]}..."
+        )
+        result["available_concepts"] = available_concepts[:20]  # First 20 for reference
+        return result
     
     # Return the most recent fact (assuming facts are ordered by date)
-    latest_fact = found_facts[0]  # Take the first one for now
+    latest_fact = fact_to_dict(found_facts[0])  # Take the first one for now
     
     return {
         "symbol": symbol,
@@ -207,28 +417,76 @@ def get_financial_fact(symbol: str, year: int, concept: str):
         "source": f"Real iXBRL Data from {file_path}"
     }
 
+def get_financial_facts(symbol: str, year: int, concepts: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Get several financial facts from one iXBRL filing, keyed by requested concept"""
+    company = _COMPANY_MAP.get(symbol.upper(), symbol.upper())
+    
+    # Look up the iXBRL filing in the on-disk index
+    file_path = find_filing_path(company, year)
+    
+    # Parse the iXBRL filing once for all concepts. The index can be up to
+    # FILING_INDEX_REFRESH_S stale, so an indexed file may already be gone
+    error = f"iXBRL filing not found: {SEC_FORMS_PATH}/{company}/10-K_{year}.html"
+    xbrl_data = None
+    if file_path is not None:
+        try:
+            xbrl_data = load_ixbrl_filing(file_path)
+            error = xbrl_data.get("error")
+        except OSError:
+            pass
+    
+    results = {}
+    for requested in concepts:
+        # Use the mapping if the concept is a common term
+        concept = _CONCEPT_MAPPING.get(requested, requested)
+        if error:
+            results[requested] = _missing_fact(symbol, year, concept, error)
+        else:
+            results[requested] = _find_fact(symbol, year, concept, file_path, xbrl_data)
+    return results
+
+def get_financial_fact(symbol: str, year: int, concept: str):
+    """Get financial fact from real iXBRL data"""
+    return get_financial_facts(symbol, year, [concept])[concept]
+
+# Shared pool for multi-year fact lookups; each filing parses independently
+_filing_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="xbrl-parse")
+
+def get_financial_facts_batch(symbol: str, years: List[int], concept: str):
+    """Get the same financial fact for several years, parsing the filings in parallel"""
+    futures = {
+        _filing_executor.submit(get_financial_fact, symbol, year, concept): year
+        for year in years
+    }
+    facts_by_year = {}
+    for future in as_completed(futures):
+        facts_by_year[futures[future]] = future.result()
+    
+    return {
+        "symbol": symbol,
+        "concept": concept,
+        "years": list(years),
+        "results": [facts_by_year[year] for year in years]
+    }
+
 def get_available_financial_concepts(symbol: str, year: int):
     """Get list of available financial concepts from iXBRL filing"""
-    company_map = {
-        "AAPL": "AAPL",
-        "MSFT": "MSFT",
-        "GOOGL": "GOOGL", 
-        "AMZN": "AMZN",
-        "TSLA": "TSLA"
-    }
+    company = _COMPANY_MAP.get(symbol.upper(), symbol.upper())
+    file_path = find_filing_path(company, year)
     
-    company = company_map.get(symbol.upper(), symbol.upper())
-    file_path = f"/mnt/d/Orca/Data/sec_forms/{company}/10-K_{year}.html"
+    try:
+        xbrl_data = load_ixbrl_filing(file_path, full_scan=True) if file_path else None
+    except OSError:
+        # Indexed file removed since the index was last refreshed
+        xbrl_data = None
     
-    if not os.path.exists(file_path):
+    if xbrl_data is None:
         return {
             "symbol": symbol,
             "year": year,
-            "error": f"iXBRL filing not found: {file_path}"
+            "error": f"iXBRL filing not found: {SEC_FORMS_PATH}/{company}/10-K_{year}.html"
         }
     
-    xbrl_data = parse_ixbrl_filing(file_path)
-    
     if "error" in xbrl_data:
         return {
             "symbol": symbol,
@@ -237,43 +495,49 @@ def get_available_financial_concepts(symbol: str, year: int):
         }
     
     facts = xbrl_data.get("facts", {})
-    concepts = list(facts.keys())
-    
-    # Filter to common financial concepts
-    common_concepts = [
-        "Revenue", "NetIncome", "GrossProfit", "TotalAssets", "TotalLiabilities",
-        "CashAndCashEquivalents", "PropertyPlantAndEquipmentNet", "Goodwill",
-        "IntangibleAssetsNet", "AccountsReceivableNet", "InventoryNet",
-        "OperatingIncome", "OperatingExpenses", "ResearchAndDevelopmentExpense",
-        "SellingGeneralAndAdministrativeExpense", "InterestExpense", "IncomeTaxExpense",
-        "EarningsPerShareBasic", "EarningsPerShareDiluted", "WeightedAverageNumberOfSharesOutstandingBasic",
-        "WeightedAverageNumberOfSharesOutstandingDiluted", "CommonStockValue",
-        "RetainedEarnings", "TotalStockholdersEquity", "NetCashProvidedByOperatingActivities",
-        "NetCashUsedInInvestingActivities", "NetCashUsedInFinancingActivities"
-    ]
-    
-    available_common = [c for c in concepts if any(common in c for common in common_concepts)]
     
     return {
         "symbol": symbol,
         "year": year,
-        "total_concepts": len(concepts),
-        "common_financial_concepts": available_common,
-        "all_concepts": concepts[:50]  # First 50 for reference
+        "total_concepts": len(facts),
+        # Filtered to common financial concepts once, when the filing was parsed
+        "common_financial_concepts": list(xbrl_data["common_concepts"]),
+        "all_concepts": list(itertools.islice(facts, 50))  # First 50 for reference
     }
 
+# How long SEC directory listings are reused before rescanning the filings tree
+SEC_LISTING_TTL_S = 300
+
+def _ttl_cache(ttl_s: float):
+    """Memoize a function on its positional args, expiring entries after ttl_s seconds"""
+    def decorator(func):
+        cache = {}
+        
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            hit = cache.get(args)
+            if hit is not None and now - hit[0] < ttl_s:
+                return hit[1]
+            value = func(*args)
+            cache[args] = (now, value)
+            return value
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+@_ttl_cache(SEC_LISTING_TTL_S)
+def _cached_companies():
+    return tuple(get_available_companies())
+
+@_ttl_cache(SEC_LISTING_TTL_S)
+def _cached_years(company: str):
+    return tuple(get_available_years(company))
+
 def get_section_text(symbol: str, year: int, section: str):
     """Get section text from real 10-K filings"""
-    # Map symbol to company directory name
-    company_map = {
-        "AAPL": "AAPL",
-        "MSFT": "MSFT",
-        "GOOGL": "GOOGL",
-        "AMZN": "AMZN",
-        "TSLA": "TSLA"
-    }
-    
-    company = company_map.get(symbol.upper(), symbol.upper())
+    company = _COMPANY_MAP.get(symbol.upper(), symbol.upper())
     
     # Get the section content from real SEC filings
     result = get_10k_section(company, year, section)
@@ -298,13 +562,35 @@ def get_section_text(symbol: str, year: int, section: str):
 
 # Simple tool classes without LangChain dependency
 class XBRLFactTool:
+    __slots__ = ()
     name = "xbrl_financial_fact_retriever"
-    description = "Retrieves a specific numerical financial fact (like Revenue, NetIncome) for a given company and year from its XBRL filing."
+    description = "Retrieves a specific numerical financial fact (like Revenue, NetIncome) for a given company and year from its XBRL filing. Passing a list as 'concepts' instead of 'concept' returns a dict of facts keyed by each requested concept."
 
-    def run(self, symbol: str, year: int, concept: str):
+    def run(self, symbol: str, year: int, concept: str = None, concepts: List[str] = None):
+        if (concept is None) == (concepts is None) or (
+            concepts is not None
+            and not (isinstance(concepts, (list, tuple)) and all(isinstance(c, str) for c in concepts))
+        ):
+            return {
+                "symbol": symbol,
+                "year": year,
+                "error": "Provide exactly one of 'concept' or 'concepts' (a list of strings)"
+            }
+        # A list of concepts is answered from a single parse of the filing
+        if concepts is not None:
+            return get_financial_facts(symbol, year, concepts)
         return get_financial_fact(symbol, year, concept)
 
+class XBRLFactBatchTool:
+    __slots__ = ()
+    name = "xbrl_financial_fact_batch_retriever"
+    description = "Retrieves the same numerical financial fact (like Revenue) for a company across several years of XBRL filings in one call."
+
+    def run(self, symbol: str, years: List[int], concept: str):
+        return get_financial_facts_batch(symbol, years, concept)
+
 class XBRLConceptsTool:
+    __slots__ = ()
     name = "xbrl_available_concepts_retriever"
     description = "Retrieves a list of available financial concepts from a company's XBRL filing for a given year."
 
@@ -312,6 +598,7 @@ class XBRLConceptsTool:
         return get_available_financial_concepts(symbol, year)
 
 class DocumentSectionTool:
+    __slots__ = ()
     name = "document_section_retriever"
     description = "Retrieves the full text of a specific section (like 'Risk Factors') from a company's 10-K HTML filing."
 
@@ -319,20 +606,21 @@ class DocumentSectionTool:
         return get_section_text(symbol, year, section)
 
 class SECDataTool:
+    __slots__ = ()
     name = "sec_data_tool"
     description = "Get information about available SEC filings and companies"
 
     def run(self, action: str, company: str = None):
         """Get SEC data information"""
         if action == "list_companies":
-            companies = get_available_companies()
+            companies = list(_cached_companies())
             return {
                 "action": action,
                 "companies": companies,
                 "count": len(companies)
             }
         elif action == "list_years" and company:
-            years = get_available_years(company)
+            years = list(_cached_years(company))
             return {
                 "action": action,
                 "company": company,
@@ -341,7 +629,7 @@ class SECDataTool:
             }
         elif action == "get_filing" and company:
             # Get the most recent year available
-            years = get_available_years(company)
+            years = list(_cached_years(company))
             if years:
                 latest_year = max(years)
                 filing_data = get_10k_filing(company, latest_year)
@@ -366,6 +654,7 @@ class SECDataTool:
 # Tool registry for easy access
 tool_registry = {
     "xbrl_financial_fact_retriever": XBRLFactTool(),
+    "xbrl_financial_fact_batch_retriever": XBRLFactBatchTool(),
     "xbrl_available_concepts_retriever": XBRLConceptsTool(),
     "document_section_retriever": DocumentSectionTool(),
     "sec_data_tool": SECDataTool()